@@ -0,0 +1,19 @@
+"""
+Reference circuits shared by the UCC integration tests.
+
+These are built once at import time; tests take a ``.copy()`` before use so
+the shared instances are never mutated.
+"""
+
+from qiskit import QuantumCircuit
+from qiskit.circuit.library import QFT
+
+# 3-qubit QFT, pre-lowered so the compiler sees plain gates rather than a
+# synthesized library block
+QFT3 = QFT(3).decompose()
+
+# 3-qubit GHZ-style preparation circuit
+BASIC_3Q_CIRC = QuantumCircuit(3, name="basic_3q")
+BASIC_3Q_CIRC.h(0)
+BASIC_3Q_CIRC.cx(0, 1)
+BASIC_3Q_CIRC.cx(1, 2)
@@ -0,0 +1,116 @@
+"""
+Shared helpers for the UCC integration tests.
+
+The integration modules compile the same small fixture circuits with the
+same pass settings many times over (threshold sweeps, repeated QFT runs,
+running a module both under pytest and as a script). The helpers here let
+those calls share work instead of re-running the full pipeline each time,
+and provide the common script entry point for every module.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+
+from qiskit import QuantumCircuit, qasm2
+from qiskit.converters import circuit_to_dag, dag_to_circuit
+from ucc import compile
+
+logger = logging.getLogger(__name__)
+
+
+# Compiled circuits keyed on a digest of the input QASM and pass settings
+_CACHE: dict[bytes, QuantumCircuit] = {}
+
+
+def compile_cached(qc, pass_cls, **pass_params):
+    """
+    Compile a circuit with a single custom pass, reusing earlier results.
+
+    Results are keyed on a BLAKE2b digest of the circuit's OpenQASM 2 text
+    together with the pass class and its constructor arguments, so pass
+    instances (whose identity differs on every call) never enter the key.
+    Callers get a copy, so mutating the result cannot corrupt the cache.
+
+    Args:
+        qc: Circuit to compile
+        pass_cls: Custom pass class appended to the default pipeline
+        **pass_params: Keyword arguments used to construct the pass
+
+    Returns:
+        The compiled circuit
+    """
+    settings = (
+        pass_cls.__module__,
+        pass_cls.__qualname__,
+        sorted(pass_params.items()),
+    )
+    key = blake2b(qasm2.dumps(qc).encode() + repr(settings).encode()).digest()
+    compiled = _CACHE.get(key)
+    if compiled is None:
+        compiled = _CACHE[key] = compile(
+            qc, custom_passes=[pass_cls(**pass_params)]
+        )
+    return compiled.copy()
+
+
+def run_pass_only(qc, pass_instance):
+    """
+    Run a single pass on a circuit, skipping the rest of the UCC pipeline.
+
+    For smoke tests of one custom pass the default layout, routing and
+    translation passes are irrelevant and dominate the runtime. The DAG
+    shares the circuit's operations rather than copying them, since the
+    passes only substitute or remove nodes and never mutate an operation
+    in place, so shared module-level circuits stay untouched.
+
+    Args:
+        qc: Circuit to optimize
+        pass_instance: Configured transformation pass
+
+    Returns:
+        The circuit produced by the pass
+    """
+    dag = circuit_to_dag(qc, copy_operations=False)
+    return dag_to_circuit(pass_instance.run(dag))
+
+
+def stats(qc):
+    """
+    Return a circuit's depth and gate counts from a single DAG build.
+
+    Args:
+        qc: Circuit to inspect
+
+    Returns:
+        Tuple of (depth, count_ops dict)
+    """
+    dag = circuit_to_dag(qc, copy_operations=False)
+    return dag.depth(), dag.count_ops()
+
+
+def run_suite(name, tests):
+    """
+    Run an integration module's tests when it is executed as a script.
+
+    The tests are independent, so each one runs in its own worker process.
+
+    Args:
+        name: Human-readable suite name used in the progress messages
+        tests: Zero-argument test callables
+    """
+    logger.debug("Starting %s tests...", name)
+
+    try:
+        with ProcessPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(test) for test in tests]
+            for future in futures:
+                future.result()
+
+        logger.debug("=" * 60)
+        logger.debug("✅ ALL %s TESTS COMPLETED SUCCESSFULLY!", name.upper())
+        logger.debug("=" * 60)
+
+    except Exception as e:
+        logger.error("❌ ERROR during %s testing: %s", name, e)
+        raise
@@ -11,6 +11,9 @@ from qiskit.transpiler.passes import GatesInBasis, CountOps
 from qiskit.transpiler.passes.utils import CheckMap
 from qiskit.transpiler.basepasses import TransformationPass
 from qiskit.circuit.library import HGate, XGate
+from qiskit.circuit.random import (
+    random_clifford_circuit as qiskit_random_clifford_circuit,
+)
 from ucc.tests.mock_backends import Mybackend
 from ucc import compile
 from ucc.transpilers.ucc_defaults import UCCDefault1
@@ -75,10 +78,8 @@ def random_clifford_circuit(num_qubits, seed=12345):
         QuantumCircuit: Clifford circuit
     """
     # This code is used to generate the QASM file
-    from qiskit.circuit.random import random_clifford_circuit
-
     gates = ["cx", "cz", "cy", "swap", "x", "y", "z", "s", "sdg", "h"]
-    qc = random_clifford_circuit(
+    qc = qiskit_random_clifford_circuit(
         num_qubits,
         gates=gates,
         num_gates=10 * num_qubits * num_qubits,
@@ -5,19 +5,35 @@ Test for IonQ Hardware Optimization Pass
 import pytest
 import numpy as np
 from qiskit import QuantumCircuit
-from qiskit.converters import circuit_to_dag
+from qiskit.converters import circuit_to_dag, dag_to_circuit
+from qiskit.quantum_info import Operator
 from ucc.transpilers.ionq_pass import IonQOptimizationPass
 from qiskit.circuit.library import RXXGate
 
 
+# Keep this module on one xdist worker so `pytest -n auto --dist loadgroup`
+# spreads the pass test modules across cores.
+pytestmark = pytest.mark.xdist_group("ionq_pass")
+
+
+@pytest.fixture(scope="class")
+def ionq_pass():
+    """
+    Default-configured IonQOptimizationPass shared by every test in the class.
+
+    The pass keeps no per-circuit state between run() calls, so one
+    instance can serve all tests instead of being rebuilt for each.
+    """
+    return IonQOptimizationPass()
+
+
 class TestIonQOptimizationPass:
     """Test cases for the IonQ optimization pass."""
 
-    def test_ionq_pass_initialization(self):
+    def test_ionq_pass_initialization(self, ionq_pass):
         """Test that IonQ pass can be initialized with default parameters."""
-        pass_instance = IonQOptimizationPass()
-        assert pass_instance.use_tket == True  # tket is available and enabled by default
-        assert pass_instance.optimization_level == 2
+        assert ionq_pass.use_tket == True  # tket is available and enabled by default
+        assert ionq_pass.optimization_level == 2
 
     def test_ionq_pass_custom_parameters(self):
         """Test that IonQ pass can be initialized with custom parameters."""
@@ -25,45 +41,151 @@ class TestIonQOptimizationPass:
         assert pass_instance.use_tket == True  # tket is available and enabled by default
         assert pass_instance.optimization_level == 3
 
-    def test_ionq_gate_set_optimization(self):
+    def test_ionq_gate_set_optimization(self, ionq_pass):
         """Test IonQ gate set optimization."""
-        from qiskit.converters import circuit_to_dag
-
         # Create circuit with non-native gates
         qc = QuantumCircuit(2)
         qc.h(0)  # H gate needs to be decomposed
         qc.x(1)  # X gate needs to be decomposed
         qc.cx(0, 1)  # CNOT needs to be decomposed
 
-        pass_instance = IonQOptimizationPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = ionq_pass.run(dag)
 
         # Should produce valid circuit
         assert optimized_dag.num_qubits() == 2
         assert len(optimized_dag.op_nodes()) > 0
 
-    def test_ionq_rotation_optimization(self):
+    def test_ionq_rotation_optimization(self, ionq_pass):
         """Test IonQ rotation optimization."""
-        from qiskit.converters import circuit_to_dag
-
         # Create circuit with multiple rotations
         qc = QuantumCircuit(1)
         qc.rx(np.pi/4, 0)
         qc.ry(np.pi/6, 0)
         qc.rx(np.pi/8, 0)  # Should be combined with first RX
 
-        pass_instance = IonQOptimizationPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = ionq_pass.run(dag)
 
         # Should produce valid circuit
         assert optimized_dag.num_qubits() == 1
 
-    def test_ionq_native_gates_preserved(self):
-        """Test that IonQ native gates are preserved."""
-        from qiskit.converters import circuit_to_dag
+    def test_ionq_full_turn_rotations_cancel(self, ionq_pass):
+        """Test that rotations summing to a full turn are removed."""
+        qc = QuantumCircuit(1)
+        qc.x(0)  # Becomes RX(π)
+        qc.x(0)
 
+        dag = circuit_to_dag(qc)
+        optimized_dag = ionq_pass.run(dag)
+
+        # RX(π)·RX(π) is a full turn and should cancel
+        assert len(optimized_dag.op_nodes()) == 0
+
+    def test_ionq_rotations_reduce_to_half_turn(self, ionq_pass):
+        """Test that summed rotation angles are reduced to (-π, π]."""
+        qc = QuantumCircuit(1)
+        qc.x(0)  # Becomes RX(π)
+        qc.x(0)
+        qc.x(0)
+
+        dag = circuit_to_dag(qc)
+        optimized_dag = ionq_pass.run(dag)
+
+        # RX(3π) is RX(π) up to a global phase
+        ops = optimized_dag.op_nodes()
+        assert len(ops) == 1
+        assert ops[0].name == 'rx'
+        assert np.isclose(ops[0].op.params[0], np.pi)
+
+    def test_ionq_rz_fuses_across_diagonal_gates(self, ionq_pass):
+        """Test that RZ runs fuse across gates they commute with."""
+        qc = QuantumCircuit(3)
+        qc.rz(np.pi/8, 0)
+        qc.cz(0, 1)  # Diagonal, so RZ on qubit 0 commutes past it
+        qc.rz(np.pi/8, 0)
+        qc.rxx(np.pi/4, 1, 2)  # Does not touch qubit 0
+
+        dag = circuit_to_dag(qc)
+        optimized_dag = ionq_pass.run(dag)
+
+        # The two RZ(π/8) gates become a single RZ(π/4)
+        rz_nodes = optimized_dag.named_nodes('rz')
+        assert len(rz_nodes) == 1
+        assert np.isclose(float(rz_nodes[0].op.params[0]), np.pi/4)
+
+    @pytest.mark.parametrize("diagonal", ['cz', 't'])
+    def test_ionq_carried_rz_keeps_order(self, ionq_pass, diagonal):
+        """Test that an RZ carried past a diagonal gate stays before a later RX."""
+        qc = QuantumCircuit(2)
+        qc.rx(0.3, 0)
+        qc.rz(0.7, 0)
+        if diagonal == 'cz':
+            qc.cz(0, 1)
+        else:
+            qc.t(0)
+        qc.rx(0.5, 0)
+
+        optimized_dag = ionq_pass.run(circuit_to_dag(qc))
+
+        assert Operator(qc).equiv(Operator(dag_to_circuit(optimized_dag)))
+
+    @pytest.mark.parametrize("diagonal", ['cz', 't'])
+    def test_ionq_carried_rz_emitted_before_rewrite(self, ionq_pass, diagonal):
+        """Test that a carried RZ is emitted before the rotations of a rewritten H."""
+        qc = QuantumCircuit(2)
+        qc.rz(0.7, 0)
+        if diagonal == 'cz':
+            qc.cz(0, 1)
+        else:
+            qc.t(0)
+        qc.h(0)
+
+        optimized_dag = ionq_pass.run(circuit_to_dag(qc))
+
+        names = [node.name for node in optimized_dag.nodes_on_wire(optimized_dag.qubits[0],
+                                                                    only_ops=True)]
+        assert names.index('rz') < names.index('rx')
+        assert names.index('rz') < names.index('ry')
+
+    @pytest.mark.parametrize("angles", [
+        (np.pi, np.pi),
+        (-np.pi,),
+        (4.0, 3.0),
+    ])
+    @pytest.mark.parametrize("gate", ['rx', 'rz'])
+    @pytest.mark.parametrize("flush_with_rxx", [True, False])
+    def test_ionq_angle_reduction_keeps_phase(self, ionq_pass, gate, angles,
+                                              flush_with_rxx):
+        """Test that reducing summed angles records the phase it introduces."""
+        qc = QuantumCircuit(2)
+        for angle in angles:
+            getattr(qc, gate)(angle, 0)
+        if flush_with_rxx:
+            qc.rxx(np.pi/4, 0, 1)  # Emits the run mid-circuit
+
+        optimized_dag = ionq_pass.run(circuit_to_dag(qc))
+
+        assert Operator(qc) == Operator(dag_to_circuit(optimized_dag))
+
+    def test_ionq_output_gates_not_shared(self, ionq_pass):
+        """Test that mutating an output gate does not leak into later runs."""
+        qc = QuantumCircuit(2)
+        qc.cx(0, 1)
+        qc.x(0)
+
+        first = dag_to_circuit(ionq_pass.run(circuit_to_dag(qc)))
+        for instruction in first.data:
+            instruction.operation.params[0] = 0.123
+            instruction.operation.label = 'mutated'
+
+        second = ionq_pass.run(circuit_to_dag(qc))
+        for node in second.op_nodes():
+            assert not np.isclose(float(node.params[0]), 0.123)
+            assert node.op.label is None
+
+    def test_ionq_native_gates_preserved(self, ionq_pass):
+        """Test that IonQ native gates are preserved."""
         # Create circuit with native IonQ gates
         qc = QuantumCircuit(2)
         qc.rx(np.pi/4, 0)
@@ -71,31 +193,25 @@ class TestIonQOptimizationPass:
         qc.rz(np.pi/8, 1)
         qc.append(RXXGate(np.pi/4), [0, 1])
 
-        pass_instance = IonQOptimizationPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = ionq_pass.run(dag)
 
         # Should preserve the structure
         assert optimized_dag.num_qubits() == 2
 
-    def test_ionq_empty_circuit(self):
+    def test_ionq_empty_circuit(self, ionq_pass):
         """Test IonQ pass on an empty circuit."""
-        from qiskit.converters import circuit_to_dag
-
         qc = QuantumCircuit(1)
 
-        pass_instance = IonQOptimizationPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = ionq_pass.run(dag)
 
         # Should return valid empty circuit
         assert optimized_dag.num_qubits() == 1
         assert len(optimized_dag.op_nodes()) == 0
 
-    def test_ionq_multi_qubit_circuit(self):
+    def test_ionq_multi_qubit_circuit(self, ionq_pass):
         """Test IonQ pass on a multi-qubit circuit."""
-        from qiskit.converters import circuit_to_dag
-
         qc = QuantumCircuit(3)
         qc.h(0)
         qc.cx(0, 1)
@@ -104,17 +220,30 @@ class TestIonQOptimizationPass:
         qc.ry(np.pi/6, 1)
         qc.rz(np.pi/8, 2)
 
-        pass_instance = IonQOptimizationPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = ionq_pass.run(dag)
 
         # Should handle multi-qubit circuit
         assert optimized_dag.num_qubits() == 3
 
+    def test_ionq_preserves_measurements(self, ionq_pass):
+        """Test that IonQ pass keeps classical bits and measurements."""
+        qc = QuantumCircuit(2, 2)
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.measure([0, 1], [0, 1])
+
+        dag = circuit_to_dag(qc)
+        optimized_dag = ionq_pass.run(dag)
+
+        # Measurements stay attached to their classical bits
+        assert optimized_dag.num_clbits() == 2
+        assert optimized_dag.count_ops()['measure'] == 2
+
 
 if __name__ == "__main__":
     # Run basic tests
     test_instance = TestIonQOptimizationPass()
-    test_instance.test_ionq_pass_initialization()
-    test_instance.test_ionq_gate_set_optimization()
+    test_instance.test_ionq_pass_initialization(IonQOptimizationPass())
+    test_instance.test_ionq_gate_set_optimization(IonQOptimizationPass())
     print("All basic IonQ tests passed!")
@@ -6,9 +6,29 @@ import pytest
 import numpy as np
 from qiskit import QuantumCircuit
 from qiskit.converters import circuit_to_dag
+from ucc.transpilers import qhrf_pass as qhrf_module
 from ucc.transpilers.qhrf_pass import QHRFPass
 
 
+# Keep this module on one xdist worker so `pytest -n auto --dist loadgroup`
+# spreads the pass test modules across cores.
+pytestmark = pytest.mark.xdist_group("qhrf_pass")
+
+
+@pytest.fixture(scope="class")
+def qhrf_pass():
+    """
+    QHRFPass shared by every test in the class.
+
+    min_circuit_size is 0 so the small test circuits are actually filtered
+    rather than returned early. The pass caches filtering decisions across
+    run() calls, but every entry is keyed on the layer's gates, qubits,
+    angles and threshold, so sharing one instance between tests cannot
+    change a result.
+    """
+    return QHRFPass(min_circuit_size=0)
+
+
 class TestQHRFPass:
     """Test cases for the QHRF optimization pass."""
 
@@ -17,25 +37,24 @@ class TestQHRFPass:
         pass_instance = QHRFPass()
         assert pass_instance.hierarchy_depth == 3
         assert pass_instance.redundancy_threshold == 0.01
+        assert pass_instance.min_circuit_size == 16
 
     def test_qhrf_pass_custom_parameters(self):
         """Test that QHRF pass can be initialized with custom parameters."""
-        pass_instance = QHRFPass(hierarchy_depth=5, redundancy_threshold=0.05)
+        pass_instance = QHRFPass(hierarchy_depth=5, redundancy_threshold=0.05, min_circuit_size=0)
         assert pass_instance.hierarchy_depth == 5
         assert pass_instance.redundancy_threshold == 0.05
+        assert pass_instance.min_circuit_size == 0
 
-    def test_qhrf_simple_circuit(self):
+    def test_qhrf_simple_circuit(self, qhrf_pass):
         """Test QHRF pass on a simple circuit."""
-        from qiskit.converters import circuit_to_dag
-
         qc = QuantumCircuit(2)
         qc.h(0)
         qc.cx(0, 1)
         qc.rx(np.pi/4, 0)
 
-        pass_instance = QHRFPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = qhrf_pass.run(dag)
 
         # Should preserve essential structure
         assert optimized_dag.num_qubits() == 2
@@ -43,25 +62,73 @@ class TestQHRFPass:
 
     def test_qhrf_redundant_operations(self):
         """Test QHRF pass on a circuit with redundant operations."""
-        from qiskit.converters import circuit_to_dag
-
         qc = QuantumCircuit(1)
         qc.rx(0.01, 0)  # Very small rotation
         qc.ry(np.pi/2, 0)  # Large rotation
         qc.rx(0.005, 0)  # Another small rotation
         qc.rz(0.02, 0)  # Small rotation
 
-        pass_instance = QHRFPass(redundancy_threshold=0.1)
+        pass_instance = QHRFPass(redundancy_threshold=0.1, min_circuit_size=0)
         dag = circuit_to_dag(qc)
         optimized_dag = pass_instance.run(dag)
 
         # Should keep the large RY rotation
         assert optimized_dag.num_qubits() == 1
 
-    def test_qhrf_multi_qubit_circuit(self):
-        """Test QHRF pass on a multi-qubit circuit."""
-        from qiskit.converters import circuit_to_dag
+    def test_qhrf_small_circuit_unchanged(self):
+        """Test that circuits below min_circuit_size are not filtered."""
+        qc = QuantumCircuit(2)
+        qc.rx(0.001, 0)  # Below threshold
+        qc.rx(0.001, 1)  # Below threshold
+
+        pass_instance = QHRFPass(redundancy_threshold=0.1)
+        dag = circuit_to_dag(qc)
+        optimized_dag = pass_instance.run(dag)
+
+        assert len(optimized_dag.op_nodes()) == 2
+
+        # With the size check disabled the second rotation is filtered
+        optimized_dag = QHRFPass(redundancy_threshold=0.1, min_circuit_size=0).run(circuit_to_dag(qc))
+        assert len(optimized_dag.op_nodes()) == 1
+
+    def test_qhrf_compiled_filter_matches_python(self, monkeypatch):
+        """Test that the compiled layer filter keeps the same operations."""
+        qc = QuantumCircuit(24)
+        for q in range(0, 24, 3):
+            qc.rx(0.002 * q, q)  # Mostly below threshold
+            qc.cx(q + 1, q + 2)
+        pass_instance = QHRFPass(redundancy_threshold=0.02)
+        layer = pass_instance._build_hierarchy(circuit_to_dag(qc))['layers'][0]
+
+        compiled = pass_instance._filter_layer_compiled(layer)
+        monkeypatch.setattr(qhrf_module, "NUMBA_AVAILABLE", False)
+        python = pass_instance._filter_layer(layer)
+
+        assert [op.index for op in compiled] == [op.index for op in python]
 
+    def test_qhrf_reuses_filter_decisions(self):
+        """Test that repeated runs on the same circuit reuse the cached decisions."""
+        qc = QuantumCircuit(2)
+        qc.rx(0.001, 0)  # Below threshold
+        qc.rx(0.001, 1)  # Below threshold
+
+        pass_instance = QHRFPass(redundancy_threshold=0.1, min_circuit_size=0)
+        first = pass_instance.run(circuit_to_dag(qc))
+        second = pass_instance.run(circuit_to_dag(qc))
+
+        assert len(pass_instance._filter_cache) == 1
+        assert first.count_ops() == second.count_ops()
+
+        # A different angle changes the contributions, so it is not a hit
+        qc = QuantumCircuit(2)
+        qc.rx(np.pi/2, 0)
+        qc.rx(0.001, 1)
+        optimized_dag = pass_instance.run(circuit_to_dag(qc))
+        assert len(pass_instance._filter_cache) == 2
+        assert optimized_dag.op_nodes()[0].op.params[0] == np.pi/2
+
+    def test_qhrf_multi_qubit_circuit(self, qhrf_pass):
+        """Test QHRF pass on a multi-qubit circuit."""
         qc = QuantumCircuit(3)
         qc.h(0)
         qc.cx(0, 1)
@@ -70,48 +137,55 @@ class TestQHRFPass:
         qc.ry(np.pi/6, 1)
         qc.rz(np.pi/8, 2)
 
-        pass_instance = QHRFPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = qhrf_pass.run(dag)
 
         # Should preserve multi-qubit structure
         assert optimized_dag.num_qubits() == 3
 
-    def test_qhrf_empty_circuit(self):
+    def test_qhrf_empty_circuit(self, qhrf_pass):
         """Test QHRF pass on an empty circuit."""
-        from qiskit.converters import circuit_to_dag
-
         qc = QuantumCircuit(1)
 
-        pass_instance = QHRFPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = qhrf_pass.run(dag)
 
         # Should return valid empty circuit
         assert optimized_dag.num_qubits() == 1
         assert len(optimized_dag.op_nodes()) == 0
 
-    def test_qhrf_connectivity_preservation(self):
+    def test_qhrf_connectivity_preservation(self, qhrf_pass):
         """Test that QHRF preserves circuit connectivity."""
-        from qiskit.converters import circuit_to_dag
-
         qc = QuantumCircuit(4)
         qc.h(0)
         qc.cx(0, 1)
         qc.cx(1, 2)
         qc.cx(2, 3)  # This connects the chain
 
-        pass_instance = QHRFPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = qhrf_pass.run(dag)
 
         # Should preserve the connecting CNOT
         assert optimized_dag.num_qubits() == 4
 
+    def test_qhrf_preserves_measurements(self, qhrf_pass):
+        """Test that QHRF keeps classical bits and measurements."""
+        qc = QuantumCircuit(2, 2)
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.measure([0, 1], [0, 1])
+
+        dag = circuit_to_dag(qc)
+        optimized_dag = qhrf_pass.run(dag)
+
+        # Measurements stay attached to their classical bits
+        assert optimized_dag.num_clbits() == 2
+        assert optimized_dag.count_ops()['measure'] == 2
+
 
 if __name__ == "__main__":
     # Run basic tests
     test_instance = TestQHRFPass()
-    test_instance.test_qhrf_pass_initialization()
-    test_instance.test_qhrf_simple_circuit()
+    test_instance.test_qhrf_pass_initialization(QHRFPass())
+    test_instance.test_qhrf_simple_circuit(QHRFPass())
     print("All basic QHRF tests passed!")
@@ -5,19 +5,49 @@ Test for SeqHT (Sequency Hierarchy Truncation) Pass
 import pytest
 import numpy as np
 from qiskit import QuantumCircuit
-from qiskit.circuit.library import RXGate, RYGate, RZGate
+from qiskit.circuit.library import RXGate, RYGate, RZGate, U3Gate
+from ucc.transpilers import seqht_pass as seqht_module
 from ucc.transpilers.seqht_pass import SeqHTPass
 from qiskit.converters import circuit_to_dag
 
 
+# Keep this module on one xdist worker so `pytest -n auto --dist loadgroup`
+# spreads the pass test modules across cores.
+pytestmark = pytest.mark.xdist_group("seqht_pass")
+
+
+@pytest.fixture(scope="class")
+def seqht_pass():
+    """
+    Default-configured SeqHTPass shared by every test in the class.
+
+    The pass caches optimized sequences and replacements across run()
+    calls, but every entry is keyed on the gates and angles it was built
+    from, so sharing one instance between tests cannot change a result.
+    """
+    return SeqHTPass()
+
+
+@pytest.fixture(scope="module")
+def base_circuit():
+    """Two-qubit circuit with rotations spanning the tested thresholds."""
+    qc = QuantumCircuit(2)
+    qc.rx(0.005, 0)
+    qc.ry(0.05, 0)
+    qc.rz(np.pi/8, 0)
+    qc.cx(0, 1)
+    qc.rx(0.3, 1)
+    qc.ry(np.pi/4, 1)
+    return qc
+
+
 class TestSeqHTPass:
     """Test cases for the SeqHT optimization pass."""
 
-    def test_seqht_pass_initialization(self):
+    def test_seqht_pass_initialization(self, seqht_pass):
         """Test that SeqHT pass can be initialized with default parameters."""
-        pass_instance = SeqHTPass()
-        assert pass_instance.truncation_threshold == 0.01
-        assert pass_instance.max_order == 3
+        assert seqht_pass.truncation_threshold == 0.01
+        assert seqht_pass.max_order == 3
 
     def test_seqht_pass_custom_parameters(self):
         """Test that SeqHT pass can be initialized with custom parameters."""
@@ -25,29 +55,27 @@ class TestSeqHTPass:
         assert pass_instance.truncation_threshold == 0.05
         assert pass_instance.max_order == 5
 
-    def test_seqht_single_rotation_gate(self):
+    def test_seqht_single_rotation_gate(self, seqht_pass):
         """Test SeqHT pass on a circuit with a single rotation gate."""
         qc = QuantumCircuit(1)
         qc.rx(np.pi/4, 0)
 
-        pass_instance = SeqHTPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = seqht_pass.run(dag)
 
         # The circuit should still be valid
         assert optimized_dag.num_qubits() == 1
         assert len(optimized_dag.op_nodes()) >= 0  # May be optimized away if below threshold
 
-    def test_seqht_multiple_rotation_gates(self):
+    def test_seqht_multiple_rotation_gates(self, seqht_pass):
         """Test SeqHT pass on a circuit with multiple rotation gates."""
         qc = QuantumCircuit(1)
         qc.rx(np.pi/4, 0)
         qc.ry(np.pi/6, 0)
         qc.rz(np.pi/8, 0)
 
-        pass_instance = SeqHTPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = seqht_pass.run(dag)
 
         # The circuit should still be valid
         assert optimized_dag.num_qubits() == 1
@@ -68,7 +96,142 @@ class TestSeqHTPass:
         # Should keep the large RY rotation but may remove small ones
         assert optimized_dag.num_qubits() == 1
 
-    def test_seqht_multi_qubit_circuit(self):
+    @pytest.mark.parametrize("threshold", [0.001, 0.01, 0.1, 0.5])
+    def test_seqht_threshold(self, threshold, base_circuit):
+        """Test SeqHT pass across truncation thresholds, one test per threshold."""
+        pass_instance = SeqHTPass(truncation_threshold=threshold)
+        dag = circuit_to_dag(base_circuit)
+        optimized_dag = pass_instance.run(dag)
+
+        # Should preserve multi-qubit structure and keep the CNOT
+        assert optimized_dag.num_qubits() == 2
+        assert optimized_dag.count_ops().get('cx', 0) == 1
+
+    def test_seqht_compiled_kernel_matches_python(self, seqht_pass):
+        """Test that the compiled kernel computes the same coefficients."""
+        qc = QuantumCircuit(3)
+        qc.rx(0.005, 0)  # Below threshold
+        qc.ry(np.pi/4, 0)
+        qc.h(0)
+        qc.rz(np.pi/8, 0)
+        qc.rx(np.pi/3, 0)
+        qc.append(U3Gate(0.3, 0.2, 0.1), [1])
+        qc.rz(np.pi/5, 1)  # Qubit 2 has no operations
+        operations = seqht_pass._extract_all_single_qubit_operations(circuit_to_dag(qc))
+
+        compiled = seqht_module._sequency_kernel(operations.codes, operations.angles,
+                                                 operations.offsets)
+        python = seqht_pass._compute_sequency_coefficients(operations)
+
+        np.testing.assert_allclose(compiled, python)
+
+    def test_seqht_small_circuits_skip_compiled_kernel(self, monkeypatch):
+        """Test that small circuits use the NumPy reduction, not the kernel."""
+        def fail(*args):
+            raise AssertionError("compiled kernel used for a small circuit")
+
+        monkeypatch.setattr(seqht_module, "_sequency_kernel", fail)
+        qc = QuantumCircuit(1)
+        qc.rx(np.pi/4, 0)
+        qc.rx(np.pi/8, 0)
+
+        optimized_dag = SeqHTPass().run(circuit_to_dag(qc))
+
+        assert np.isclose(float(optimized_dag.op_nodes()[0].params[0]), 3*np.pi/8)
+
+    def test_seqht_reuses_optimized_sequences(self):
+        """Test that identical rotation sequences are optimized once."""
+        qc = QuantumCircuit(3)
+        for q in range(3):
+            qc.rx(np.pi/4, q)
+            qc.rz(np.pi/8, q)
+
+        pass_instance = SeqHTPass()
+        optimized_dag = pass_instance.run(circuit_to_dag(qc))
+
+        assert len(pass_instance._sequence_cache) == 1
+        assert optimized_dag.count_ops() == {'rx': 3, 'rz': 3}
+
+    def test_seqht_cached_sequences_build_new_gates(self):
+        """Test that gates built from a cached sequence are never shared."""
+        qc = QuantumCircuit(2)
+        for q in range(2):
+            qc.rx(np.pi/4, q)
+            qc.rx(np.pi/8, q)
+
+        pass_instance = SeqHTPass()
+        first = pass_instance.run(circuit_to_dag(qc))
+        # Each qubit's first RX is the fused replacement
+        first_ops = [next(first.nodes_on_wire(q, only_ops=True)).op for q in first.qubits]
+        assert first_ops[0] is not first_ops[1]
+        for op in first_ops:
+            op.params[0] = 9.0
+
+        # A different circuit with the same per-qubit sequence
+        qc.h(1)
+        second = pass_instance.run(circuit_to_dag(qc))
+
+        for q in second.qubits:
+            node = next(second.nodes_on_wire(q, only_ops=True))
+            assert np.isclose(float(node.params[0]), 3*np.pi/8)
+
+    def test_seqht_reuses_circuit_replacements(self):
+        """Test that re-running an identical circuit reuses its replacements."""
+        qc = QuantumCircuit(2)
+        qc.rx(np.pi/4, 0)
+        qc.rz(np.pi/8, 0)
+        qc.cx(0, 1)
+        qc.ry(np.pi/3, 1)
+        qc.ry(np.pi/6, 1)
+
+        pass_instance = SeqHTPass()
+        first = pass_instance.run(circuit_to_dag(qc))
+        second = pass_instance.run(circuit_to_dag(qc))
+
+        assert len(pass_instance._replacement_cache) == 1
+        assert first == second
+
+    def test_seqht_cached_replacements_build_new_gates(self):
+        """Test that mutating an output does not leak into a cached re-run."""
+        qc = QuantumCircuit(1)
+        qc.rx(np.pi/4, 0)
+        qc.rx(np.pi/8, 0)
+
+        pass_instance = SeqHTPass()
+        first = pass_instance.run(circuit_to_dag(qc))
+        next(first.nodes_on_wire(first.qubits[0], only_ops=True)).op.params[0] = 9.0
+        second = pass_instance.run(circuit_to_dag(qc))
+
+        node = next(second.nodes_on_wire(second.qubits[0], only_ops=True))
+        assert np.isclose(float(node.params[0]), 3*np.pi/8)
+
+    def test_seqht_single_rotation_left_unchanged(self, seqht_pass):
+        """Test that a qubit with only one rotation is not rewritten."""
+        qc = QuantumCircuit(1)
+        qc.h(0)
+        qc.rx(np.pi/4, 0)
+
+        dag = circuit_to_dag(qc)
+        optimized_dag = seqht_pass.run(dag)
+
+        # The H gate must not be replaced by the lone rotation
+        assert [node.name for node in optimized_dag.topological_op_nodes()] == ['h', 'rx']
+
+    def test_seqht_replacements_stay_on_their_qubit(self, seqht_pass):
+        """Test that extra optimized gates never spill onto the next qubit."""
+        qc = QuantumCircuit(2)
+        qc.append(U3Gate(0.3, 0.2, 0.1), [0])  # Yields RX, RY and RZ components
+        qc.rx(0.4, 0)
+        qc.z(1)
+        qc.ry(np.pi/4, 1)
+
+        dag = circuit_to_dag(qc)
+        optimized_dag = seqht_pass.run(dag)
+
+        qubit_1 = optimized_dag.qubits[1]
+        assert [node.name for node in optimized_dag.nodes_on_wire(qubit_1, only_ops=True)] == ['z', 'ry']
+
+    def test_seqht_multi_qubit_circuit(self, seqht_pass):
         """Test SeqHT pass on a multi-qubit circuit."""
         qc = QuantumCircuit(2)
         qc.h(0)
@@ -77,34 +240,45 @@ class TestSeqHTPass:
         qc.ry(np.pi/6, 1)
         qc.rz(np.pi/8, 1)
 
-        pass_instance = SeqHTPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = seqht_pass.run(dag)
 
         # Should preserve multi-qubit structure
         assert optimized_dag.num_qubits() == 2
         # Should have at least the CNOT gate
         assert len(optimized_dag.op_nodes()) >= 1
 
-    def test_seqht_u3_gate(self):
+    def test_seqht_u3_gate(self, seqht_pass):
         """Test SeqHT pass on a circuit with U3 gates."""
         qc = QuantumCircuit(1)
         qc.u(np.pi/4, np.pi/6, np.pi/8, 0)  # U3 equivalent
 
-        pass_instance = SeqHTPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = seqht_pass.run(dag)
 
         # Should handle U3 decomposition
         assert optimized_dag.num_qubits() == 1
 
-    def test_seqht_empty_circuit(self):
+    def test_seqht_u3_angle_split(self, seqht_pass):
+        """Test that U3(θ, φ, λ) adds θ to the RY and φ + λ to the RZ component."""
+        qc = QuantumCircuit(1)
+        qc.append(U3Gate(0.3, 0.2, 0.1), [0])
+        qc.rx(0.4, 0)
+        operations = seqht_pass._extract_all_single_qubit_operations(circuit_to_dag(qc))
+
+        compiled = seqht_module._sequency_kernel(operations.codes, operations.angles,
+                                                 operations.offsets)
+        python = seqht_pass._compute_sequency_coefficients(operations)
+
+        np.testing.assert_allclose(compiled, [[0.4, 0.3, 0.3]])
+        np.testing.assert_allclose(python, [[0.4, 0.3, 0.3]])
+
+    def test_seqht_empty_circuit(self, seqht_pass):
         """Test SeqHT pass on an empty circuit."""
         qc = QuantumCircuit(1)
 
-        pass_instance = SeqHTPass()
         dag = circuit_to_dag(qc)
-        optimized_dag = pass_instance.run(dag)
+        optimized_dag = seqht_pass.run(dag)
 
         # Should return valid empty circuit
         assert optimized_dag.num_qubits() == 1
@@ -114,7 +288,7 @@ class TestSeqHTPass:
 if __name__ == "__main__":
     # Run basic tests
     test_instance = TestSeqHTPass()
-    test_instance.test_seqht_pass_initialization()
-    test_instance.test_seqht_single_rotation_gate()
-    test_instance.test_seqht_multiple_rotation_gates()
+    test_instance.test_seqht_pass_initialization(SeqHTPass())
+    test_instance.test_seqht_single_rotation_gate(SeqHTPass())
+    test_instance.test_seqht_multiple_rotation_gates(SeqHTPass())
     print("All basic SeqHT tests passed!")
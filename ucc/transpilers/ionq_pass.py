@@ -12,15 +12,15 @@ The pass applies IonQ-specific optimizations including:
 - Error mitigation strategies specific to trapped-ion systems
 """
 
+import math
+
 import numpy as np
-from qiskit.converters import dag_to_circuit, circuit_to_dag
 from qiskit.transpiler.basepasses import TransformationPass
 from qiskit.dagcircuit import DAGCircuit
-from qiskit.circuit import QuantumCircuit
+from qiskit.circuit import ParameterExpression
 from qiskit.circuit.library import RXGate, RYGate, RZGate, RXXGate
 from qiskit.transpiler import Target
-from typing import Optional, Dict, List
-from collections import defaultdict
+from typing import Optional, Dict, List, Tuple
 
 try:
     from pytket import Circuit as TKCircuit
@@ -28,6 +28,65 @@ try:
 except ImportError:
     TKET_AVAILABLE = False
 
+# Axis codes used to accumulate single-qubit rotations
+_ROTATION_AXES = {'rx': 0, 'ry': 1, 'rz': 2}
+_ROTATION_NAMES = ('rx', 'ry', 'rz')
+_RZ_AXIS = _ROTATION_AXES['rz']
+_ROTATION_GATES = (RXGate, RYGate, RZGate)
+
+# Angles used by the native-gate rewrites, computed once
+_PI = np.pi
+_PI_HALF = np.pi / 2
+_NEG_PI_HALF = -np.pi / 2
+_PI_QUARTER = np.pi / 4
+
+_RX_AXIS = _ROTATION_AXES['rx']
+_RY_AXIS = _ROTATION_AXES['ry']
+
+
+def _rotation_gate(axis: int, angle: float):
+    """Return a new rotation gate about the given axis."""
+    return _ROTATION_GATES[axis](angle)
+
+
+def _canonical_angle(total: float) -> float:
+    """
+    Reduce a summed rotation angle to (-π, π].
+
+    Rotations by ±π differ only by a global phase, so both map to π; a
+    full turn reduces to 0. Each 2π removed flips the sign of the rotation,
+    so callers add (total - angle) / 2 to the circuit's global phase.
+    """
+    angle = math.remainder(total, 2 * math.pi)
+    if abs(abs(angle) - _PI) < 1e-10:
+        return _PI
+    return angle
+
+
+# Rewrites of non-native gates into IonQ native gates, keyed by gate name.
+# Each entry is (rotations, trailing_gate): the rotations are
+# (axis_code, angle, qarg_position) triples fed straight into the rotation
+# accumulator, followed by an optional (gate_class, params) native gate on the
+# node's qubits. Gates are built per emission, since the output DAG hands its
+# operations to the caller, who may mutate them.
+_REWRITE_TABLE = {
+    # H = RY(π/2) * RX(π)
+    'h': (((_RY_AXIS, _PI_HALF, 0), (_RX_AXIS, _PI, 0)), None),
+    # X = RX(π)
+    'x': (((_RX_AXIS, _PI, 0),), None),
+    # Y = RY(π)
+    'y': (((_RY_AXIS, _PI, 0),), None),
+    # Z = RZ(π)
+    'z': (((_RZ_AXIS, _PI, 0),), None),
+    # CNOT can be decomposed using XX gates
+    # For IonQ: CNOT = XX(π/4) * RX(-π/2) on control * RX(-π/2) on target
+    'cx': (((_RX_AXIS, _NEG_PI_HALF, 0), (_RX_AXIS, _NEG_PI_HALF, 1)),
+           (RXXGate, (_PI_QUARTER,))),
+}
+
+# Gates diagonal in the computational basis, which RZ commutes with
+_DIAGONAL_GATES = frozenset({'cz', 'cp', 'crz', 'rzz', 'p', 'u1', 's', 'sdg', 't', 'tdg'})
+
 
 class IonQOptimizationPass(TransformationPass):
     """
@@ -71,218 +130,261 @@ class IonQOptimizationPass(TransformationPass):
         Returns:
             Optimized DAG for IonQ hardware
         """
-        # Convert DAG to circuit for analysis
-        circuit = dag_to_circuit(dag)
-
-        # Apply IonQ-specific optimizations
+        # Work on the DAG directly; round-tripping through QuantumCircuit
+        # costs a full traversal at each end of the pass
         if self.use_tket:
-            optimized_circuit = self._apply_tket_optimization(circuit)
-        else:
-            optimized_circuit = self._apply_qiskit_optimization(circuit)
+            return self._apply_tket_optimization(dag)
+        return self._apply_qiskit_optimization(dag)
 
-        # Convert back to DAG
-        return circuit_to_dag(optimized_circuit)
-
-    def _apply_tket_optimization(self, circuit: QuantumCircuit) -> QuantumCircuit:
+    def _apply_tket_optimization(self, dag: DAGCircuit) -> DAGCircuit:
         """
         Apply tket-based optimizations for IonQ.
 
         Args:
-            circuit: Input quantum circuit
+            dag: Input quantum circuit as DAG
 
         Returns:
-            Optimized quantum circuit
+            Optimized DAG
         """
         # For now, fall back to Qiskit-only optimization
         # TODO: Implement tket integration when available
         print("IonQ Optimization: tket not fully available, using Qiskit-only optimization")
-        return self._apply_qiskit_optimization(circuit)
+        return self._apply_qiskit_optimization(dag)
 
-    def _apply_qiskit_optimization(self, circuit: QuantumCircuit) -> QuantumCircuit:
+    def _apply_qiskit_optimization(self, dag: DAGCircuit) -> DAGCircuit:
         """
         Apply Qiskit-based optimizations for IonQ.
 
         Args:
-            circuit: Input quantum circuit
+            dag: Input quantum circuit as DAG
 
         Returns:
-            Optimized quantum circuit
+            Optimized DAG
         """
-        optimized_circuit = circuit.copy()
-
         # Apply IonQ-specific optimizations
-        optimized_circuit = self._optimize_gate_set(optimized_circuit)
-        optimized_circuit = self._optimize_rotations(optimized_circuit)
-        optimized_circuit = self._optimize_connectivity(optimized_circuit)
+        optimized_dag = self._rewrite_and_fuse(dag)
+        optimized_dag = self._optimize_connectivity(optimized_dag)
 
-        return optimized_circuit
+        return optimized_dag
 
-    def _optimize_gate_set(self, circuit: QuantumCircuit) -> QuantumCircuit:
+    def _rewrite_and_fuse(self, dag: DAGCircuit) -> DAGCircuit:
         """
-        Optimize gate set for IonQ native gates.
+        Convert to IonQ native gates and fuse rotations in a single walk.
+
+        Rotations produced by rewriting non-native gates (e.g. the RY/RX of a
+        Hadamard) go straight into the per-qubit rotation accumulator, so no
+        intermediate DAG of unfused native gates is ever built.
 
         Args:
-            circuit: Input circuit
+            dag: Input DAG
 
         Returns:
-            Circuit with IonQ-optimized gate set
+            DAG in IonQ native gates with optimized rotations
         """
         # IonQ native gates: RX, RY, RZ, XX
-        # Convert non-native gates to native representation
-
-        optimized_circuit = QuantumCircuit(circuit.num_qubits)
+        optimized_dag = dag.copy_empty_like()
+        q2i = {q: i for i, q in enumerate(dag.qubits)}
+
+        # Collect consecutive single-qubit rotations for optimization, one
+        # preallocated run per qubit that is cleared in place when emitted
+        rotation_sequences = [[] for _ in range(dag.num_qubits())]
+        # Whether a qubit's run is an RZ carried past a diagonal gate, which
+        # has to be emitted before any later RX/RY on that qubit
+        carried = [False] * dag.num_qubits()
+
+        for node in dag.topological_op_nodes():
+            qargs = node.qargs
+            rewrite = _REWRITE_TABLE.get(node.name)
+
+            if rewrite is not None:
+                # Convert gates to IonQ native set
+                rotations, trailing_gate = rewrite
+                for axis, angle, position in rotations:
+                    qubit_idx = q2i[qargs[position]]
+                    if carried[qubit_idx] and axis != _RZ_AXIS:
+                        self._emit_carried(optimized_dag, rotation_sequences, carried,
+                                           qubit_idx, qargs[position])
+                    rotation_sequences[qubit_idx].append((axis, angle))
+                if trailing_gate is not None:
+                    gate_class, params = trailing_gate
+                    gate = gate_class(*params)
+                    self._flush_rotations(optimized_dag, rotation_sequences, qargs,
+                                          gate.name, q2i, carried)
+                    optimized_dag.apply_operation_back(gate, qargs, check=False)
+
+            # Symbolic angles cannot be summed numerically, so those
+            # rotations are kept as-is like any other gate. The angle is read
+            # once from the node, which avoids building a Python gate object
+            # for standard gates the way node.op does
+            elif (len(qargs) == 1 and node.name in _ROTATION_AXES
+                    and not isinstance(angle := node.params[0], ParameterExpression)):
+                qubit_idx = q2i[qargs[0]]
+                axis = _ROTATION_AXES[node.name]
+                if carried[qubit_idx] and axis != _RZ_AXIS:
+                    self._emit_carried(optimized_dag, rotation_sequences, carried,
+                                       qubit_idx, qargs[0])
+                rotation_sequences[qubit_idx].append((axis, angle))
 
-        for instruction_data in circuit.data:
-            # Handle both old and new Qiskit versions
-            if hasattr(instruction_data, 'operation'):
-                instruction = instruction_data.operation
-                qargs = instruction_data.qubits
-                cargs = instruction_data.clbits
             else:
-                instruction, qargs, cargs = instruction_data
-
-            gate_name = instruction.name
-            qubits = [circuit.find_bit(q).index for q in qargs]
-
-            # Convert gates to IonQ native set
-            if gate_name == 'h':
-                # H = RY(π/2) * RX(π)
-                optimized_circuit.ry(np.pi/2, qubits[0])
-                optimized_circuit.rx(np.pi, qubits[0])
-            elif gate_name == 'x':
-                # X = RX(π)
-                optimized_circuit.rx(np.pi, qubits[0])
-            elif gate_name == 'y':
-                # Y = RY(π)
-                optimized_circuit.ry(np.pi, qubits[0])
-            elif gate_name == 'z':
-                # Z = RZ(π)
-                optimized_circuit.rz(np.pi, qubits[0])
-            elif gate_name == 'cx':
-                # CNOT can be decomposed using XX gates
-                # For IonQ: CNOT = XX(π/4) * RX(-π/2) on control * RX(-π/2) on target
-                control, target = qubits
-                optimized_circuit.rx(-np.pi/2, control)
-                optimized_circuit.rx(-np.pi/2, target)
-                optimized_circuit.append(RXXGate(np.pi/4), [control, target])
-            elif gate_name in ['rx', 'ry', 'rz', 'rxx']:
-                # Already native gates
-                optimized_circuit.append(instruction, qubits, [])
-            else:
-                # Keep other gates as-is for now
-                optimized_circuit.append(instruction, qubits, [])
+                # Native gates (rxx, ...) and anything else pass through
+                self._flush_rotations(optimized_dag, rotation_sequences, qargs, node.name, q2i,
+                                      carried)
+                optimized_dag.apply_operation_back(node.op, qargs, node.cargs, check=False)
+
+        # Process any remaining rotations
+        self._flush_all_rotations(optimized_dag, rotation_sequences)
 
-        return optimized_circuit
+        return optimized_dag
 
-    def _optimize_rotations(self, circuit: QuantumCircuit) -> QuantumCircuit:
+    def _flush_all_rotations(self, dag: DAGCircuit, rotation_sequences: List[list]) -> None:
         """
-        Optimize rotation gates for IonQ hardware.
+        Emit the pending rotations on every qubit at the end of the circuit.
 
-        Args:
-            circuit: Input circuit
+        All runs are summed in one bincount over (qubit, axis) bins, and the
+        surviving rotations are appended in a single loop.
 
-        Returns:
-            Circuit with optimized rotations
+        Args:
+            dag: DAG being built
+            rotation_sequences: Pending (axis_code, angle) run for each qubit index
+        """
+        num_qubits = len(rotation_sequences)
+        bins = [q_idx * 3 + axis
+                for q_idx, sequence in enumerate(rotation_sequences) for axis, _ in sequence]
+        if not bins:
+            return
+        angles = [angle for sequence in rotation_sequences for _, angle in sequence]
+
+        # Same reduction as _optimize_rotation_sequence, for all qubits at once
+        totals = np.bincount(bins, weights=angles, minlength=3 * num_qubits).reshape(num_qubits, 3)
+        qubits = dag.qubits
+        phase = 0.0
+        for q_idx in np.flatnonzero(totals.any(axis=1)):
+            qubit = (qubits[q_idx],)
+            for axis, total in enumerate(totals[q_idx].tolist()):
+                angle = _canonical_angle(total)
+                phase += (total - angle) / 2
+                if abs(angle) > 1e-10:
+                    dag.apply_operation_back(_rotation_gate(axis, angle), qubit, check=False)
+        if phase:
+            dag.global_phase += phase
+
+    def _flush_rotations(self, dag: DAGCircuit, rotation_sequences: List[list],
+                         qargs, gate_name: str, q2i: Dict, carried: List[bool]) -> None:
         """
-        optimized_circuit = QuantumCircuit(circuit.num_qubits)
+        Emit the pending rotations on the qubits a gate is about to act on.
 
-        # Collect consecutive single-qubit rotations for optimization
-        rotation_sequences = defaultdict(list)
+        Only those qubits need their rotations emitted first; runs on other
+        qubits keep accumulating.
 
-        for instruction_data in circuit.data:
-            # Handle both old and new Qiskit versions
-            if hasattr(instruction_data, 'operation'):
-                instruction = instruction_data.operation
-                qargs = instruction_data.qubits
-                cargs = instruction_data.clbits
+        Args:
+            dag: DAG being built
+            rotation_sequences: Pending (axis_code, angle) run for each qubit index
+            qargs: Qubits of the upcoming gate
+            gate_name: Name of the upcoming gate
+            q2i: Qubit to index map
+            carried: Per-qubit flag marking runs carried past a diagonal gate
+        """
+        diagonal = gate_name in _DIAGONAL_GATES
+        for q in qargs:
+            q_idx = q2i[q]
+            sequence = rotation_sequences[q_idx]
+            if not sequence:
+                continue
+            if diagonal:
+                # RZ commutes with diagonal gates, so the RZ part of the run
+                # stays pending and can fuse across the gate
+                emitted = [r for r in sequence if r[0] != _RZ_AXIS]
+                sequence[:] = [r for r in sequence if r[0] == _RZ_AXIS]
+                carried[q_idx] = bool(sequence)
             else:
-                instruction, qargs, cargs = instruction_data
+                emitted = sequence[:]
+                sequence.clear()
+                carried[q_idx] = False
+            if emitted:
+                optimized_rotations, phase = self._optimize_rotation_sequence(emitted)
+                if phase:
+                    dag.global_phase += phase
+                self._apply_rotations(dag, optimized_rotations, q)
+
+    def _emit_carried(self, dag: DAGCircuit, rotation_sequences: List[list],
+                      carried: List[bool], q_idx: int, qubit) -> None:
+        """
+        Emit an RZ run that was carried past a diagonal gate.
 
-            if len(qargs) == 1 and instruction.name in ['rx', 'ry', 'rz']:
-                qubit_idx = circuit.find_bit(qargs[0]).index
-                rotation_sequences[qubit_idx].append((instruction.name, instruction.params[0]))
-            else:
-                # Process accumulated rotations for each qubit
-                for q_idx in rotation_sequences:
-                    if rotation_sequences[q_idx]:
-                        optimized_rotations = self._optimize_rotation_sequence(rotation_sequences[q_idx])
-                        for gate_name, angle in optimized_rotations:
-                            if gate_name == 'rx':
-                                optimized_circuit.rx(angle, q_idx)
-                            elif gate_name == 'ry':
-                                optimized_circuit.ry(angle, q_idx)
-                            elif gate_name == 'rz':
-                                optimized_circuit.rz(angle, q_idx)
-
-                # Clear rotation sequences
-                rotation_sequences = defaultdict(list)
-
-                # Add the non-rotation gate
-                qubits = [circuit.find_bit(q).index for q in qargs]
-                optimized_circuit.append(instruction, qubits, [])
+        The carried RZ sits before any RX/RY queued after the diagonal gate,
+        so it cannot be summed into the same run without reordering them.
 
-        # Process any remaining rotations
-        for q_idx in rotation_sequences:
-            if rotation_sequences[q_idx]:
-                optimized_rotations = self._optimize_rotation_sequence(rotation_sequences[q_idx])
-                for gate_name, angle in optimized_rotations:
-                    if gate_name == 'rx':
-                        optimized_circuit.rx(angle, q_idx)
-                    elif gate_name == 'ry':
-                        optimized_circuit.ry(angle, q_idx)
-                    elif gate_name == 'rz':
-                        optimized_circuit.rz(angle, q_idx)
-
-        return optimized_circuit
-
-    def _optimize_rotation_sequence(self, rotations: List[tuple]) -> List[tuple]:
+        Args:
+            dag: DAG being built
+            rotation_sequences: Pending (axis_code, angle) run for each qubit index
+            carried: Per-qubit flag marking runs carried past a diagonal gate
+            q_idx: Index of the qubit
+            qubit: Qubit the run acts on
         """
-        Optimize a sequence of rotations on the same qubit.
+        sequence = rotation_sequences[q_idx]
+        optimized_rotations, phase = self._optimize_rotation_sequence(sequence)
+        if phase:
+            dag.global_phase += phase
+        self._apply_rotations(dag, optimized_rotations, qubit)
+        sequence.clear()
+        carried[q_idx] = False
+
+    def _apply_rotations(self, dag: DAGCircuit, rotations: List[tuple], qubit) -> None:
+        """
+        Append a sequence of rotations on one qubit to the back of a DAG.
 
         Args:
+            dag: DAG to extend
             rotations: List of (gate_name, angle) tuples
+            qubit: Qubit the rotations act on
+        """
+        for gate_name, angle in rotations:
+            gate = _rotation_gate(_ROTATION_AXES[gate_name], angle)
+            dag.apply_operation_back(gate, (qubit,), check=False)
 
-        Returns:
-            Optimized rotation sequence
+    def _optimize_rotation_sequence(self, rotations: List[tuple]) -> Tuple[List[tuple], float]:
         """
-        # Group rotations by axis
-        rx_total = 0.0
-        ry_total = 0.0
-        rz_total = 0.0
+        Optimize a sequence of rotations on the same qubit.
 
-        for gate_name, angle in rotations:
-            if gate_name == 'rx':
-                rx_total += angle
-            elif gate_name == 'ry':
-                ry_total += angle
-            elif gate_name == 'rz':
-                rz_total += angle
+        Args:
+            rotations: List of (axis_code, angle) tuples, with axis codes
+                from _ROTATION_AXES
+
+        Returns:
+            Tuple of the optimized rotation sequence as (gate_name, angle)
+            tuples and the global phase picked up by reducing the angles
+        """
+        # Sum the angles per axis in a single reduction
+        axes = np.fromiter((axis for axis, _ in rotations), dtype=np.int8, count=len(rotations))
+        angles = np.fromiter((angle for _, angle in rotations), dtype=np.float64, count=len(rotations))
+        totals = np.bincount(axes, weights=angles, minlength=3)
 
         # Create optimized sequence
         optimized = []
+        phase = 0.0
 
-        # Add non-zero rotations
-        if abs(rx_total) > 1e-10:
-            optimized.append(('rx', rx_total))
-        if abs(ry_total) > 1e-10:
-            optimized.append(('ry', ry_total))
-        if abs(rz_total) > 1e-10:
-            optimized.append(('rz', rz_total))
+        # Add non-zero rotations; reducing to (-π, π] lets full turns such as
+        # RX(π)·RX(π) cancel and folds RX(3π) down to RX(π)
+        for gate_name, total in zip(_ROTATION_NAMES, totals.tolist()):
+            angle = _canonical_angle(total)
+            phase += (total - angle) / 2
+            if abs(angle) > 1e-10:
+                optimized.append((gate_name, angle))
 
-        return optimized
+        return optimized, phase
 
-    def _optimize_connectivity(self, circuit: QuantumCircuit) -> QuantumCircuit:
+    def _optimize_connectivity(self, dag: DAGCircuit) -> DAGCircuit:
         """
         Optimize for IonQ's all-to-all connectivity.
 
         Args:
-            circuit: Input circuit
+            dag: Input DAG
 
         Returns:
-            Circuit optimized for IonQ connectivity
+            DAG optimized for IonQ connectivity
         """
         # IonQ has all-to-all connectivity, so minimal routing is needed
         # Focus on gate ordering for parallelism
 
-        # For now, return the circuit as-is since IonQ connectivity is optimal
-        return circuit
+        # For now, return the DAG as-is since IonQ connectivity is optimal
+        return dag
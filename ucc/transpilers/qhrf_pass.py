@@ -8,13 +8,147 @@ while maintaining fidelity.
 """
 
 import numpy as np
-from qiskit.converters import dag_to_circuit, circuit_to_dag
+from dataclasses import dataclass
+from scipy.cluster.hierarchy import DisjointSet
 from qiskit.transpiler.basepasses import TransformationPass
-from qiskit.dagcircuit import DAGCircuit
-from qiskit.circuit import QuantumCircuit
+from qiskit.dagcircuit import DAGCircuit, DAGOpNode
 from qiskit.circuit.library import RXGate, RYGate, RZGate, CXGate
 from typing import Optional, Dict, List, Tuple
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function as plain Python."""
+        return lambda func: func
+
+# Layers with at least this many operations are filtered by the compiled
+# kernel; below it the JIT call overhead outweighs the interpreter cost
+_KERNEL_MIN_LAYER_SIZE = 16
+
+# Number of filter decisions each pass instance remembers
+_FILTER_CACHE_SIZE = 64
+
+# Contribution categories used by the compiled kernel, mirroring
+# QHRFPass._calculate_operation_contribution
+_CATEGORY_FIXED = 0     # h, x, y, z
+_CATEGORY_ROTATION = 1  # rx, ry, rz: scored by angle
+_CATEGORY_TWO_QUBIT = 2  # cx, cz, swap
+_CATEGORY_OTHER = 3
+_GATE_CATEGORIES = {
+    'h': _CATEGORY_FIXED, 'x': _CATEGORY_FIXED, 'y': _CATEGORY_FIXED, 'z': _CATEGORY_FIXED,
+    'rx': _CATEGORY_ROTATION, 'ry': _CATEGORY_ROTATION, 'rz': _CATEGORY_ROTATION,
+    'cx': _CATEGORY_TWO_QUBIT, 'cz': _CATEGORY_TWO_QUBIT, 'swap': _CATEGORY_TWO_QUBIT,
+}
+
+
+@njit(cache=True)
+def _find_root(parent, q):
+    while parent[q] != q:
+        parent[q] = parent[parent[q]]
+        q = parent[q]
+    return q
+
+
+@njit(cache=True)
+def _filter_layer_kernel(categories, similar_counts, qubit_offsets, qubit_indices,
+                         angles, num_qubits, threshold):
+    """
+    Score, sort and filter one layer given as parallel arrays.
+
+    Operation i acts on qubit_indices[qubit_offsets[i]:qubit_offsets[i + 1]],
+    and similar_counts[i] is the number of operations in the layer with its
+    gate name and qubit set, itself included.
+
+    Returns:
+        Tuple of (order, keep): operation indices sorted by contribution
+        (highest first, ties in layer order) and a keep mask per operation
+    """
+    n = categories.shape[0]
+    contributions = np.empty(n)
+    for i in range(n):
+        category = categories[i]
+        if category == 0:
+            base = 1.0
+        elif category == 1:
+            base = min(abs(angles[i]) / np.pi, 1.0)
+        elif category == 2:
+            base = 1.5
+        else:
+            base = 0.8
+
+        # Reduce contribution if similar operations exist on same qubits
+        similar_ops = similar_counts[i] - 1
+        if similar_ops > 0:
+            base *= 1.0 / (similar_ops + 1)
+        contributions[i] = base
+
+    # Nothing is a removal candidate, so every operation is kept
+    if contributions.min() > threshold:
+        return np.arange(n), np.ones(n, dtype=np.bool_)
+
+    # Stable sort keeps equal contributions in layer order, like sorted()
+    order = np.argsort(-contributions, kind='mergesort')
+
+    # Union-find over the qubits of kept operations; -1 marks untouched qubits
+    parent = np.full(num_qubits, -1, dtype=np.int64)
+    keep = np.zeros(n, dtype=np.bool_)
+    any_kept = False
+    for i in order:
+        start, stop = qubit_offsets[i], qubit_offsets[i + 1]
+        if contributions[i] > threshold or not any_kept:
+            keep[i] = True
+        else:
+            # Keep the operation only if it bridges separate qubit groups
+            first_root = -1
+            for k in range(start, stop):
+                q = qubit_indices[k]
+                if parent[q] < 0:
+                    continue
+                root = _find_root(parent, q)
+                if first_root < 0:
+                    first_root = root
+                elif root != first_root:
+                    keep[i] = True
+                    break
+        if keep[i]:
+            any_kept = True
+            for k in range(start, stop):
+                q = qubit_indices[k]
+                if parent[q] < 0:
+                    parent[q] = q
+            for k in range(start + 1, stop):
+                root_a = _find_root(parent, qubit_indices[start])
+                root_b = _find_root(parent, qubit_indices[k])
+                if root_a != root_b:
+                    parent[root_b] = root_a
+
+    return order, keep
+
+
+@dataclass(slots=True)
+class HierOp:
+    """
+    One operation in the QHRF hierarchy.
+
+    Attributes:
+        name: Name of the operation's gate, read from the node so that no
+            Python gate object is built for it
+        node: DAG node the operation came from
+        qubits: Qubit indices the operation acts on
+        sorted_qubits: The qubit indices in ascending order, used to compare
+            qubit sets without building a set
+        index: Position in the hierarchy (layer * 100 + position in layer)
+    """
+    name: str
+    node: DAGOpNode
+    qubits: tuple
+    sorted_qubits: tuple
+    index: int
 
 
 class QHRFPass(TransformationPass):
@@ -33,17 +167,23 @@ class QHRFPass(TransformationPass):
     by breaking them down into manageable subcircuits.
     """
 
-    def __init__(self, hierarchy_depth: int = 3, redundancy_threshold: float = 0.01):
+    def __init__(self, hierarchy_depth: int = 3, redundancy_threshold: float = 0.01,
+                 min_circuit_size: int = 16):
         """
         Initialize the QHRF pass.
 
         Args:
             hierarchy_depth: Maximum depth of hierarchical analysis
             redundancy_threshold: Minimum contribution threshold for operation preservation
+            min_circuit_size: Circuits with fewer operations than this are
+                returned unchanged
         """
         super().__init__()
         self.hierarchy_depth = hierarchy_depth
         self.redundancy_threshold = redundancy_threshold
+        self.min_circuit_size = min_circuit_size
+        # Kept positions per layer, keyed by hierarchy fingerprint
+        self._filter_cache = OrderedDict()
 
     def run(self, dag: DAGCircuit) -> DAGCircuit:
         """
@@ -55,91 +195,111 @@ class QHRFPass(TransformationPass):
         Returns:
             Optimized DAG with reduced complexity
         """
-        # Convert DAG to circuit for analysis
-        circuit = dag_to_circuit(dag)
+        # Small circuits have little to filter, so skip the hierarchy build
+        if dag.size() < self.min_circuit_size:
+            return dag
 
-        # Apply QHRF optimization
-        optimized_circuit = self._apply_qhrf_optimization(circuit)
+        # Filtering only removes operations, so it is applied to the DAG in
+        # place rather than round-tripping through QuantumCircuit
+        return self._apply_qhrf_optimization(dag)
 
-        # Convert back to DAG
-        return circuit_to_dag(optimized_circuit)
-
-    def _apply_qhrf_optimization(self, circuit: QuantumCircuit) -> QuantumCircuit:
+    def _apply_qhrf_optimization(self, dag: DAGCircuit) -> DAGCircuit:
         """
-        Apply QHRF optimization to the circuit.
+        Apply QHRF optimization to the DAG.
 
         Args:
-            circuit: Input quantum circuit
+            dag: Input quantum circuit as DAG
 
         Returns:
-            Optimized quantum circuit
+            Optimized DAG
         """
         # Build hierarchical representation
-        hierarchy = self._build_hierarchy(circuit)
+        hierarchy = self._build_hierarchy(dag)
+        layers = hierarchy['layers']
+
+        # Reuse the decisions from an earlier run on the same circuit
+        fingerprint = self._hierarchy_fingerprint(hierarchy)
+        decisions = self._filter_cache.get(fingerprint)
+        if decisions is not None:
+            self._filter_cache.move_to_end(fingerprint)
+            hierarchy['layers'] = [[layer[i] for i in kept]
+                                   for layer, kept in zip(layers, decisions) if kept]
+            return self._remove_filtered_operations(dag, layers, hierarchy)
 
         # Apply recursive filtering
         filtered_hierarchy = self._apply_recursive_filtering(hierarchy)
 
-        # Reconstruct circuit from filtered hierarchy
-        optimized_circuit = self._reconstruct_from_hierarchy(filtered_hierarchy, circuit.num_qubits)
+        kept_ops = {id(op) for layer in filtered_hierarchy['layers'] for op in layer}
+        self._filter_cache[fingerprint] = tuple(
+            tuple(i for i, op in enumerate(layer) if id(op) in kept_ops) for layer in layers
+        )
+        if len(self._filter_cache) > _FILTER_CACHE_SIZE:
+            self._filter_cache.popitem(last=False)
 
-        return optimized_circuit
+        # Remove the operations the filtering dropped
+        return self._remove_filtered_operations(dag, layers, filtered_hierarchy)
 
-    def _build_hierarchy(self, circuit: QuantumCircuit) -> Dict:
+    def _build_hierarchy(self, dag: DAGCircuit) -> Dict:
         """
         Build hierarchical representation of the circuit.
 
         Args:
-            circuit: Input quantum circuit
+            dag: Input quantum circuit as DAG
 
         Returns:
             Hierarchical representation
         """
         hierarchy = {
-            'qubits': circuit.num_qubits,
+            'qubits': dag.num_qubits(),
             'layers': [],
             'connections': defaultdict(list)
         }
 
-        # Group operations by "layers" (concurrent operations)
-        current_layer = []
-        active_qubits = set()
+        # Map qubits to indices once instead of calling find_bit per qarg
+        q2i = {q: i for i, q in enumerate(dag.qubits)}
+
+        # Group operations by "layers" (concurrent operations), taking the
+        # DAG's own ASAP layering instead of re-deriving it gate by gate
+        for layer_nodes in dag.multigraph_layers():
+            current_layer = []
+            for node in layer_nodes:
+                # Layers also hold the DAG's input and output wire nodes
+                if not isinstance(node, DAGOpNode):
+                    continue
+
+                qubits = tuple(q2i[q] for q in node.qargs)
+                current_layer.append(HierOp(
+                    name=node.name,
+                    node=node,
+                    qubits=qubits,
+                    sorted_qubits=tuple(sorted(qubits)),
+                    index=len(hierarchy['layers']) * 100 + len(current_layer),
+                ))
+
+            if current_layer:
+                hierarchy['layers'].append(current_layer)
 
-        for instruction_data in circuit.data:
-            # Handle both old and new Qiskit versions
-            if hasattr(instruction_data, 'operation'):
-                instruction = instruction_data.operation
-                qargs = instruction_data.qubits
-                cargs = instruction_data.clbits
-            else:
-                instruction, qargs, cargs = instruction_data
-
-            # Get qubit indices
-            qubit_indices = [circuit.find_bit(q).index for q in qargs]
-
-            # Check if this operation conflicts with current layer
-            if any(idx in active_qubits for idx in qubit_indices):
-                # Start new layer
-                if current_layer:
-                    hierarchy['layers'].append(current_layer)
-                current_layer = []
-                active_qubits = set()
+        return hierarchy
 
-            # Add operation to current layer
-            current_layer.append({
-                'gate': instruction,
-                'qubits': qubit_indices,
-                'index': len(hierarchy['layers']) * 100 + len(current_layer)
-            })
+    def _hierarchy_fingerprint(self, hierarchy: Dict) -> Tuple:
+        """
+        Build a key identifying everything the filtering decisions depend on.
 
-            # Mark qubits as active
-            active_qubits.update(qubit_indices)
+        Rotation contributions scale with the angle, so rotation angles are
+        part of the key along with the gate names, qubits and threshold.
 
-        # Add final layer
-        if current_layer:
-            hierarchy['layers'].append(current_layer)
+        Args:
+            hierarchy: Hierarchical representation
 
-        return hierarchy
+        Returns:
+            Hashable fingerprint of the hierarchy
+        """
+        return (self.redundancy_threshold, tuple(
+            tuple((op.name, op.sorted_qubits,
+                   op.node.params[0] if _GATE_CATEGORIES.get(op.name) == _CATEGORY_ROTATION else None)
+                  for op in layer)
+            for layer in hierarchy['layers']
+        ))
 
     def _apply_recursive_filtering(self, hierarchy: Dict) -> Dict:
         """
@@ -149,21 +309,14 @@ class QHRFPass(TransformationPass):
             hierarchy: Hierarchical representation
 
         Returns:
-            Filtered hierarchy
+            Filtered hierarchy (the input, with its layers replaced)
         """
-        filtered_hierarchy = hierarchy.copy()
-        filtered_hierarchy['layers'] = []
-
-        for layer in hierarchy['layers']:
-            # Apply filtering to this layer
-            filtered_layer = self._filter_layer(layer)
-
-            if filtered_layer:
-                filtered_hierarchy['layers'].append(filtered_layer)
-
-        return filtered_hierarchy
+        # The hierarchy is built fresh for each run, so filter it in place
+        hierarchy['layers'] = [filtered_layer for layer in hierarchy['layers']
+                               if (filtered_layer := self._filter_layer(layer))]
+        return hierarchy
 
-    def _filter_layer(self, layer: List[Dict]) -> List[Dict]:
+    def _filter_layer(self, layer: List[HierOp]) -> List[HierOp]:
         """
         Filter a single layer to remove redundant operations.
 
@@ -176,138 +329,174 @@ class QHRFPass(TransformationPass):
         if len(layer) <= 1:
             return layer
 
+        if NUMBA_AVAILABLE and len(layer) >= _KERNEL_MIN_LAYER_SIZE:
+            return self._filter_layer_compiled(layer)
+
         filtered_layer = []
         operation_contributions = {}
 
+        # Count operations per (gate name, qubit set) once for the whole layer
+        counts = Counter((op.name, op.sorted_qubits) for op in layer)
+
         # Calculate contribution of each operation
         for i, op in enumerate(layer):
-            contribution = self._calculate_operation_contribution(op, layer)
+            contribution = self._calculate_operation_contribution(op, counts)
             operation_contributions[i] = contribution
 
+        # Nothing is a removal candidate, so the layer survives unchanged
+        if min(operation_contributions.values()) > self.redundancy_threshold:
+            return layer
+
         # Sort by contribution (highest first)
         sorted_ops = sorted(operation_contributions.items(), key=lambda x: x[1], reverse=True)
 
+        # Qubit groups connected by the operations kept so far, grown
+        # incrementally instead of being rebuilt for every candidate
+        qubit_groups = DisjointSet()
+
         # Keep operations above threshold
         for idx, contribution in sorted_ops:
             if contribution > self.redundancy_threshold:
                 filtered_layer.append(layer[idx])
             else:
                 # Check if removing this operation affects connectivity
-                if not self._breaks_connectivity(layer[idx], filtered_layer):
+                if not self._breaks_connectivity(layer[idx], qubit_groups):
                     continue  # Skip this operation
                 else:
                     filtered_layer.append(layer[idx])  # Keep for connectivity
 
+            self._connect_qubits(qubit_groups, layer[idx].qubits)
+
         return filtered_layer
 
-    def _calculate_operation_contribution(self, operation: Dict, layer: List[Dict]) -> float:
+    def _filter_layer_compiled(self, layer: List[HierOp]) -> List[HierOp]:
+        """
+        Filter a layer with the compiled kernel.
+
+        Packs the layer into parallel arrays for _filter_layer_kernel and maps
+        its keep mask back onto the operations. Produces the same result as
+        the pure-Python path in _filter_layer.
+
+        Args:
+            layer: Layer of operations
+
+        Returns:
+            Filtered layer
+        """
+        # Count operations per (gate name, qubit set) once for the whole layer
+        counts = Counter((op.name, op.sorted_qubits) for op in layer)
+        categories = []
+        similar_counts = []
+        angles = []
+        qubit_counts = []
+        for op in layer:
+            category = _GATE_CATEGORIES.get(op.name, _CATEGORY_OTHER)
+            categories.append(category)
+            similar_counts.append(counts[(op.name, op.sorted_qubits)])
+            angles.append(float(op.node.params[0]) if category == _CATEGORY_ROTATION else 0.0)
+            qubit_counts.append(len(op.qubits))
+
+        qubit_offsets = np.zeros(len(layer) + 1, dtype=np.int64)
+        np.cumsum(qubit_counts, out=qubit_offsets[1:])
+        qubit_indices = np.fromiter((q for op in layer for q in op.qubits),
+                                    dtype=np.int64, count=qubit_offsets[-1])
+        num_qubits = int(qubit_indices.max()) + 1 if len(qubit_indices) else 0
+
+        order, keep = _filter_layer_kernel(
+            np.array(categories, dtype=np.int32), np.array(similar_counts, dtype=np.int64),
+            qubit_offsets, qubit_indices, np.array(angles, dtype=np.float64),
+            num_qubits, self.redundancy_threshold,
+        )
+        return [layer[i] for i in order if keep[i]]
+
+    def _calculate_operation_contribution(self, operation: HierOp, counts: Counter) -> float:
         """
         Calculate the contribution of an operation to the layer.
 
         Args:
             operation: Operation to analyze
-            layer: Full layer of operations
+            counts: Number of operations in the layer per (gate name,
+                sorted qubit tuple)
 
         Returns:
             Contribution score
         """
-        gate = operation['gate']
-        qubits = operation['qubits']
+        name = operation.name
 
         # Base contribution depends on gate type
-        if gate.name in ['h', 'x', 'y', 'z']:
+        category = _GATE_CATEGORIES.get(name, _CATEGORY_OTHER)
+        if category == _CATEGORY_FIXED:
             base_contribution = 1.0
-        elif gate.name in ['rx', 'ry', 'rz']:
+        elif category == _CATEGORY_ROTATION:
             # Parametric gates have contribution based on angle magnitude
-            if hasattr(gate, 'params') and len(gate.params) > 0:
-                angle = abs(gate.params[0])
+            params = operation.node.params
+            if len(params) > 0:
+                angle = abs(params[0])
                 base_contribution = min(angle / np.pi, 1.0)
             else:
                 base_contribution = 0.5
-        elif gate.name in ['cx', 'cz', 'swap']:
+        elif category == _CATEGORY_TWO_QUBIT:
             base_contribution = 1.5  # Two-qubit gates are more important
         else:
             base_contribution = 0.8
 
         # Reduce contribution if similar operations exist on same qubits
-        similar_ops = sum(1 for op in layer
-                         if op != operation and
-                         set(op['qubits']) == set(qubits) and
-                         op['gate'].name == gate.name)
+        similar_ops = counts[(name, operation.sorted_qubits)] - 1
 
         if similar_ops > 0:
             base_contribution *= (1.0 / (similar_ops + 1))
 
         return base_contribution
 
-    def _breaks_connectivity(self, operation: Dict, current_layer: List[Dict]) -> bool:
+    def _breaks_connectivity(self, operation: HierOp, qubit_groups: DisjointSet) -> bool:
         """
         Check if removing an operation would break circuit connectivity.
 
         Args:
             operation: Operation being considered for removal
-            current_layer: Current filtered layer
+            qubit_groups: Qubit groups connected by the operations kept so far
 
         Returns:
             True if removal would break connectivity
         """
-        if not current_layer:
+        if not qubit_groups:
             return True  # Can't break connectivity if no operations
 
-        # Check if this operation connects different qubit groups
-        qubit_groups = []
-        for op in current_layer:
-            qubit_groups.append(set(op['qubits']))
-
-        # Merge overlapping groups
-        merged_groups = []
-        for group in qubit_groups:
-            # Find overlapping groups
-            overlapping = []
-            for i, existing_group in enumerate(merged_groups):
-                if group & existing_group:
-                    overlapping.append(i)
-
-            if overlapping:
-                # Merge with first overlapping group
-                merged_groups[overlapping[0]].update(group)
-                # Merge all other overlapping groups
-                for i in reversed(overlapping[1:]):
-                    merged_groups[overlapping[0]].update(merged_groups[i])
-                    del merged_groups[i]
-            else:
-                merged_groups.append(group.copy())
-
-        # Check if operation connects different groups
-        op_qubits = set(operation['qubits'])
-        connected_groups = []
-
-        for i, group in enumerate(merged_groups):
-            if op_qubits & group:
-                connected_groups.append(i)
-
         # If operation connects multiple groups, it's important for connectivity
+        connected_groups = {qubit_groups[q] for q in operation.qubits if q in qubit_groups}
         return len(connected_groups) > 1
 
-    def _reconstruct_from_hierarchy(self, hierarchy: Dict, num_qubits: int) -> QuantumCircuit:
+    def _connect_qubits(self, qubit_groups: DisjointSet, qubits: Tuple[int, ...]) -> None:
         """
-        Reconstruct circuit from filtered hierarchy.
+        Record that a kept operation connects its qubits.
 
         Args:
-            hierarchy: Filtered hierarchy
-            num_qubits: Number of qubits
+            qubit_groups: Qubit groups connected by the operations kept so far
+            qubits: Qubit indices of the kept operation
+        """
+        for q in qubits:
+            qubit_groups.add(q)
+        for q in qubits[1:]:
+            qubit_groups.merge(qubits[0], q)
+
+    def _remove_filtered_operations(self, dag: DAGCircuit, layers: List[List[HierOp]],
+                                    filtered_hierarchy: Dict) -> DAGCircuit:
+        """
+        Remove operations dropped by the filtering from the DAG.
+
+        Args:
+            dag: DAG the hierarchy was built from
+            layers: Layers of the hierarchy before filtering
+            filtered_hierarchy: Filtered hierarchy
 
         Returns:
-            Reconstructed quantum circuit
+            The DAG with the dropped operations removed
         """
-        circuit = QuantumCircuit(num_qubits)
+        kept = {id(operation) for layer in filtered_hierarchy['layers'] for operation in layer}
 
-        for layer in hierarchy['layers']:
+        for layer in layers:
             for operation in layer:
-                gate = operation['gate']
-                qubits = operation['qubits']
-
-                # Add operation to circuit
-                circuit.append(gate, qubits, [])
+                if id(operation) not in kept:
+                    dag.remove_op_node(operation.node)
 
-        return circuit
+        return dag